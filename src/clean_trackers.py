@@ -1,7 +1,49 @@
+import functools
+import mmap
 import re
 import sys
 from urllib.parse import urlparse, urlunparse, parse_qs, urlencode, unquote
 
+# hyperscan scans for URLs with a SIMD-accelerated DFA at multi-GB/s,
+# worthwhile on very large inputs; Python's re remains the fallback.
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# This regex is broad to catch any URL-like string inside quotes.
+URL_RE = re.compile(rb'https?://[^\s"]+')
+
+def find_url_spans(data):
+    """Finds the (start, end) byte span of every URL in one scan.
+
+    Accepts any bytes-like object (including an mmap). Spans are returned
+    sorted and non-overlapping, longest match per start position.
+    """
+    if hyperscan is not None:
+        db = hyperscan.Database()
+        db.compile(expressions=[rb'https?://[^\s"]+'], ids=[0],
+                   flags=[hyperscan.HS_FLAG_SOM_LEFTMOST])
+        # Hyperscan reports a match at every possible end offset; keep the
+        # longest end per start to mirror the regex's greedy matching.
+        ends = {}
+        def on_match(_id, start, end, _flags, _ctx):
+            ends[start] = max(ends.get(start, 0), end)
+        db.scan(data, match_event_handler=on_match)
+        spans = []
+        last_end = 0
+        for start in sorted(ends):
+            if start >= last_end:  # skip matches inside a longer one
+                last_end = ends[start]
+                spans.append((start, last_end))
+        return spans
+    return [m.span() for m in URL_RE.finditer(data)]
+
+def find_urls(content):
+    """Finds all unique URLs in a string in one scan."""
+    data = content.encode('utf-8')
+    return {data[s:e].decode('utf-8', 'ignore') for s, e in find_url_spans(data)}
+
 # --- Python URL Tracker Remover ---
 # This script reads a file, finds all URLs, and recursively removes 
 # common tracking parameters from their query strings, even if they are nested.
@@ -18,7 +60,7 @@ from urllib.parse import urlparse, urlunparse, parse_qs, urlencode, unquote
 #   This will create a new file named 'a2z_cleaned.json'.
 
 # List of common tracking parameters to be removed from URLs.
-TRACKING_PARAMS = {
+TRACKING_PARAMS = frozenset({
     # Google Analytics
     'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
     # Google Ads
@@ -31,41 +73,70 @@ TRACKING_PARAMS = {
     'mc_cid', 'mc_eid',
     # Other common trackers
     '_ga',
-}
+})
 
 # List of sites where all query parameters and fragments should be stripped.
-SITES_TO_STRIP = [
+SITES_TO_STRIP = (
     'geeksforgeeks.org',
     'codingninjas.com',
     'leetcode.com',
-]
+)
+
+# Hosts are matched exactly or by '.site' suffix: endswith on a tuple is a
+# single C-level check, and unlike a substring scan it cannot be fooled by
+# lookalike hosts such as 'leetcode.com.evil.example'.
+_STRIP_SITES = frozenset(SITES_TO_STRIP)
+_STRIP_SUFFIXES = tuple('.' + site for site in SITES_TO_STRIP)
+
+def _host_matches(netloc, sites, suffixes):
+    """True when netloc is one of sites or a subdomain of one."""
+    return netloc in sites or netloc.endswith(suffixes)
+
+# urlparse is pure Python and shows up for every URL (and again for every
+# URL embedded in a query string); its result is an immutable namedtuple so
+# caching it is safe. Mirrors scrapy's urlparse_cached pattern.
+_urlparse = functools.lru_cache(maxsize=4096)(urlparse)
 
+@functools.lru_cache(maxsize=None)
 def clean_url(url):
     """
     Recursively removes known tracking parameters from a URL.
     Includes special rules to strip all parameters and fragments from specific sites,
     and to standardize YouTube URLs, keeping only the video ID and timestamp.
+
+    The function is pure, so results are memoized: URLs embedded in many
+    different query strings (share/redirect targets) are cleaned once and the
+    recursive calls on duplicates become dictionary lookups.
     """
+    # Fast prefilter: a URL with no query or fragment carries nothing the
+    # tracker and strip-site rules could remove, and only the YouTube rule
+    # rewrites such URLs (youtu.be short links). A few substring tests
+    # answer the common case without ever parsing the URL.
+    if ('?' not in url and '#' not in url and 'youtu' not in url
+            and not any(site in url for site in SITES_TO_STRIP)):
+        return url
     try:
         # 1. Parse the URL into its components (scheme, netloc, path, etc.)
-        parsed_url = urlparse(url)
+        parsed_url = _urlparse(url)
         
         # --- Site-Specific Rules ---
         # Rule for sites in SITES_TO_STRIP: remove all query params and fragments.
-        if any(site in parsed_url.netloc for site in SITES_TO_STRIP):
+        if _host_matches(parsed_url.netloc, _STRIP_SITES, _STRIP_SUFFIXES):
             cleaned_url_parts = parsed_url._replace(query='', fragment='')
             return urlunparse(cleaned_url_parts)
         
         # Rule for YouTube: standardize the URL, keeping only 'v' and 't' parameters.
-        if 'youtube.com' in parsed_url.netloc or 'youtu.be' in parsed_url.netloc:
+        is_youtube = _host_matches(parsed_url.netloc, ('youtube.com',), ('.youtube.com',))
+        is_youtu_be = _host_matches(parsed_url.netloc, ('youtu.be',), ('.youtu.be',))
+        if is_youtube or is_youtu_be:
             video_id = None
             timestamp = None
             query_params = parse_qs(parsed_url.query)
 
-            if 'youtube.com' in parsed_url.netloc:
+            if is_youtube:
                 if 'v' in query_params:
                     video_id = query_params['v'][0]
-            elif 'youtu.be' in parsed_url.netloc:
+            else:
                 video_id = parsed_url.path.lstrip('/')
             
             # Check for and preserve the timestamp parameter 't'
@@ -125,10 +196,11 @@ def main():
 
     input_file = sys.argv[1]
 
-    # 2. Read the file content
+    # 2. Map the file into memory instead of reading it into a string; the
+    # scan and the rewrite both work on byte offsets, so the content is
+    # never duplicated (read copy + replaced copy) in the heap.
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        f = open(input_file, 'rb')
     except FileNotFoundError:
         print(f"Error: File not found at '{input_file}'")
         sys.exit(1)
@@ -136,40 +208,53 @@ def main():
         print(f"An error occurred while reading the file: {e}")
         sys.exit(1)
 
-    # 3. Find all unique URLs in the content.
-    # This regex is broad to catch any URL-like string inside quotes.
-    urls = set(re.findall(r'https?://[^\s"]+', content))
-
-    if not urls:
-        print("No URLs found in the file.")
-        return
-
-    print(f"🔎 Found {len(urls)} unique URLs. Cleaning them now...")
-
-    # 4. Create a mapping from original URLs to their cleaned versions.
-    url_map = {}
-    for url in urls:
-        cleaned = clean_url(url)
-        # Only add to the map if the URL was actually changed.
-        if url != cleaned:
-            url_map[url] = cleaned
-            print(f"Original: {url}\nCleaned:  {cleaned}\n")
-
-    # 5. Replace all tracked URLs in the original content.
-    print("\n🔄 Replacing tracked URLs in the content...")
-    for original, cleaned in url_map.items():
-        # We replace the original URL string to ensure we don't accidentally
-        # modify parts of other, longer URLs.
-        content = content.replace(f'"{original}"', f'"{cleaned}"')
-
-    # 6. Save the modified content to a new file.
-    output_file = f"{input_file.split('.')[0]}_cleaned.json"
-    try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"\n✨ Success! Modified content saved to '{output_file}'")
-    except Exception as e:
-        print(f"\n❌ Error saving the file: {e}")
+    with f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped; a zero-length read is equivalent.
+            data = f.read()
+
+        # 3. Find the span of every URL in the content.
+        spans = find_url_spans(data)
+
+        if not spans:
+            print("No URLs found in the file.")
+            return
+
+        urls = {data[start:end].decode('utf-8', 'ignore') for start, end in spans}
+        print(f"🔎 Found {len(urls)} unique URLs. Cleaning them now...")
+
+        # 4. Create a mapping from original URLs to their cleaned versions.
+        url_map = {}
+        for url in urls:
+            cleaned = clean_url(url)
+            # Only add to the map if the URL was actually changed.
+            if url != cleaned:
+                url_map[url] = cleaned
+                print(f"Original: {url}\nCleaned:  {cleaned}\n")
+
+        # 5/6. Stream the content to the output file, splicing in the
+        # cleaned URLs at their recorded offsets. Only URLs wrapped in
+        # quotes are rewritten, so we never modify part of a longer URL.
+        print("\n🔄 Replacing tracked URLs in the content...")
+        output_file = f"{input_file.split('.')[0]}_cleaned.json"
+        try:
+            with open(output_file, 'wb') as out:
+                pos = 0
+                for start, end in spans:
+                    cleaned = url_map.get(data[start:end].decode('utf-8', 'ignore'))
+                    if cleaned is None:
+                        continue
+                    if start == 0 or data[start - 1:start] != b'"' or data[end:end + 1] != b'"':
+                        continue
+                    out.write(data[pos:start])
+                    out.write(cleaned.encode('utf-8'))
+                    pos = end
+                out.write(data[pos:])
+            print(f"\n✨ Success! Modified content saved to '{output_file}'")
+        except Exception as e:
+            print(f"\n❌ Error saving the file: {e}")
 
 if __name__ == "__main__":
     main()
